@@ -1,8 +1,23 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import os
+import re
+import orjson
+import heapq
+import threading
+from collections import Counter
+from functools import lru_cache, wraps
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dotenv import load_dotenv
 
+try:
+    import redis
+except ImportError:
+    redis = None
+
 # Load environment variables
 load_dotenv()
 
@@ -12,10 +27,178 @@ app = Flask(__name__)
 CRYPTOPANIC_API_KEY = os.environ.get('CRYPTOPANIC_API_KEY', '')
 NEWSAPI_KEY = os.environ.get('NEWSAPI_KEY', '')
 
+# Concurrent requests per server worker (keep in sync with gunicorn --worker-connections)
+WORKER_CONNECTIONS = int(os.environ.get('WORKER_CONNECTIONS', 200))
+
+# Upper bound on upstream sources queried per search
+MAX_SOURCES = 3
+
+# Shared worker pool for upstream fetches (reused across requests), sized so every
+# in-flight search can run all of its sources at once. Threads are started lazily,
+# and under gevent workers they are greenlets.
+FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=WORKER_CONNECTIONS * MAX_SOURCES)
+
+# Searches currently being fetched, shared with concurrent identical requests
+INFLIGHT = {}
+INFLIGHT_LOCK = threading.Lock()
+
+# Upstream request timeout: (connect, read) in seconds
+UPSTREAM_TIMEOUT = (0.5, 1.2)
+
+# Attempts per upstream call (first try + one retry on connect errors or 502/503/504)
+UPSTREAM_ATTEMPTS = 2
+
+# Overall time budget for all sources in a search, in seconds. Each source's worst case,
+# (connect + read) * attempts = 3.4s, fits inside it so retries can still finish in time.
+SEARCH_DEADLINE = 3.5
+
+# Extra time a coalesced search waits on the leader beyond the deadline (cache reads/writes)
+INFLIGHT_WAIT_MARGIN = 1.0
+
+# Shared HTTP session so keep-alive connections are reused across fetches
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Read timeouts are not retried and Retry-After is ignored, so a stalled upstream
+    # cannot push a source past SEARCH_DEADLINE
+    max_retries=Retry(
+        total=UPSTREAM_ATTEMPTS - 1,
+        read=0,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        respect_retry_after_header=False
+    )
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+SESSION.headers.update({
+    # gzip/deflate, plus br when brotli is installed so urllib3 can decode it
+    "Accept-Encoding": ACCEPT_ENCODING,
+    "User-Agent": "cryptopulse/2.0"
+})
+
+# Response cache (optional - enabled when REDIS_URL is set)
+REDIS_URL = os.environ.get('REDIS_URL', '')
+CACHE = redis.Redis(connection_pool=redis.ConnectionPool.from_url(
+    REDIS_URL,
+    socket_timeout=0.2,
+    socket_connect_timeout=0.2
+)) if redis and REDIS_URL else None
+CACHE_STATS = Counter()
+
+# Cache TTLs in seconds
+PRICES_TTL = 30
+NEWS_TTL = 120
+SEARCH_TTL = 60
+
+# Coin keywords recognised in queries, matched in a single regex pass
+COIN_RE = re.compile(r'\b(bitcoin|btc|ethereum|eth|solana|sol|cardano|ada|xrp|ripple)\b', re.IGNORECASE | re.ASCII)
+
+# Word tokens used for relevance scoring
+WORD_RE = re.compile(r'\w+')
+
+# Map coin keywords to CoinGecko coin IDs
+KEYWORD_TO_ID = {
+    'bitcoin': 'bitcoin',
+    'btc': 'bitcoin',
+    'ethereum': 'ethereum',
+    'eth': 'ethereum',
+    'solana': 'solana',
+    'sol': 'solana',
+    'cardano': 'cardano',
+    'ada': 'cardano',
+    'xrp': 'ripple',
+    'ripple': 'ripple'
+}
+
+# Coins always requested from CoinGecko markets (all KEYWORD_TO_ID coins included)
+TOP_COIN_IDS = [
+    'bitcoin', 'ethereum', 'tether', 'binancecoin', 'solana',
+    'ripple', 'usd-coin', 'cardano', 'dogecoin', 'tron'
+]
+
+# Map coin keywords to CryptoPanic currency codes
+KEYWORD_TO_CURRENCY = {
+    'bitcoin': 'BTC',
+    'btc': 'BTC',
+    'ethereum': 'ETH',
+    'eth': 'ETH',
+    'solana': 'SOL',
+    'sol': 'SOL'
+}
+
+def cache_get(key):
+    """
+    Return the cached value for key, or None on a miss
+    """
+    if CACHE is None:
+        return None
+    
+    try:
+        raw = CACHE.get(key)
+        value = orjson.loads(raw) if raw is not None else None
+    except Exception as e:
+        print(f"Error reading from cache: {e}")
+        return None
+    
+    if value is None:
+        CACHE_STATS['cache_miss'] += 1
+        return None
+    
+    CACHE_STATS['cache_hit'] += 1
+    return value
+
+def cache_set(key, ttl, value):
+    """
+    Store value under key for ttl seconds
+    """
+    if CACHE is None:
+        return
+    
+    try:
+        CACHE.setex(key, ttl, orjson.dumps(value))
+    except Exception as e:
+        print(f"Error writing to cache: {e}")
+
+def cached(source, ttl):
+    """
+    Cache a fetch function's results per (source, query)
+    Empty results are not cached so failed fetches are retried
+    """
+    def decorator(fetch):
+        @wraps(fetch)
+        def wrapper(query):
+            key = f"cp:{source}:{query.lower().strip()}"
+            results = cache_get(key)
+            if results is not None:
+                return results
+            
+            results = fetch(query)
+            if results:
+                cache_set(key, ttl, results)
+            return results
+        return wrapper
+    return decorator
+
+# Static health check response body, serialized once at startup
+HEALTH_BODY = orjson.dumps({"status": "healthy"})
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    return jsonify({"status": "healthy"}), 200
+    return Response(HEALTH_BODY, mimetype='application/json'), 200
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Cache hit/miss counters for this worker process"""
+    return jsonify({
+        "cache": {
+            "enabled": CACHE is not None,
+            "cache_hit": CACHE_STATS['cache_hit'],
+            "cache_miss": CACHE_STATS['cache_miss']
+        }
+    }), 200
 
 @app.route('/search', methods=['POST'])
 def search():
@@ -34,14 +217,14 @@ def search():
         filter_param = data.get('filter', '')
         
         # Fetch crypto news based on query
-        news_results = fetch_crypto_news(query, filter_param)
+        news_results = fetch_search_results(query, filter_param)
         
         # Format response according to agent schema
         response = {
             "search_results": news_results
         }
         
-        return jsonify(response), 200
+        return Response(orjson.dumps(response), mimetype='application/json'), 200
         
     except Exception as e:
         print(f"Error in search endpoint: {e}")
@@ -50,34 +233,85 @@ def search():
             "search_results": []
         }), 500
 
+def fetch_search_results(query, filter_param=''):
+    """
+    Fetch crypto news for a search, serving repeated queries from cache
+    Concurrent identical searches share a single upstream fan-out
+    """
+    search_key = f"{query.lower().strip()}:{filter_param}"
+    cache_key = f"cp:search:{search_key}"
+    
+    news_results = cache_get(cache_key)
+    if news_results is not None:
+        return news_results
+    
+    # Wait on an identical search that is already in flight
+    with INFLIGHT_LOCK:
+        future = INFLIGHT.get(search_key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            INFLIGHT[search_key] = future
+    
+    if not is_leader:
+        return future.result(timeout=SEARCH_DEADLINE + INFLIGHT_WAIT_MARGIN)
+    
+    try:
+        news_results, complete = fetch_crypto_news(query, filter_param)
+        
+        # Cache before releasing the in-flight entry so no request slips between the two.
+        # Partial results are not cached, so late sources are picked up by the next search.
+        if news_results and complete:
+            cache_set(cache_key, SEARCH_TTL, news_results)
+        future.set_result(news_results)
+    except BaseException as e:
+        # Also covers GreenletExit/Timeout under gevent so waiters are never left hanging
+        if not future.done():
+            future.set_exception(e)
+        raise
+    finally:
+        with INFLIGHT_LOCK:
+            del INFLIGHT[search_key]
+    
+    return news_results
+
 def fetch_crypto_news(query, filter_param=''):
     """
     Fetch crypto news from multiple sources
+    Returns (results, complete) where complete is False if any source missed the deadline
     """
     results = []
     
-    # Source 1: CoinGecko Trending (Always works - no key needed)
-    coingecko_results = fetch_from_coingecko(query)
-    results.extend(coingecko_results)
+    # Source 1: CoinGecko top coins & prices (Always works - no key needed)
+    sources = [fetch_from_coingecko]
     
     # Source 2: CryptoPanic (if API key is available)
     if CRYPTOPANIC_API_KEY:
-        cryptopanic_results = fetch_from_cryptopanic(query)
-        results.extend(cryptopanic_results)
+        sources.append(fetch_from_cryptopanic)
     
-    # Source 3: CoinGecko Market Data
-    market_results = fetch_crypto_prices(query)
-    results.extend(market_results)
-    
-    # Source 4: NewsAPI for crypto news (if key available)
+    # Source 3: NewsAPI for crypto news (if key available)
     if NEWSAPI_KEY:
-        news_results = fetch_from_newsapi(query)
-        results.extend(news_results)
+        sources.append(fetch_from_newsapi)
+    
+    # Run all sources concurrently, returning whatever finishes within the deadline
+    futures = {FETCH_EXECUTOR.submit(source, query): source for source in sources}
+    done, not_done = wait(futures, timeout=SEARCH_DEADLINE)
+    
+    for future in not_done:
+        future.cancel()
+        print(f"{futures[future].__name__} missed the {SEARCH_DEADLINE}s deadline, "
+              "still running in the background; returning results without it")
     
-    # Limit to top 10 results and sort by relevance score
-    results.sort(key=lambda x: x.get('result_metadata', {}).get('score', 0), reverse=True)
-    return results[:10]
+    for future in done:
+        try:
+            results.extend(future.result())
+        except Exception as e:
+            print(f"Error in {futures[future].__name__}: {e}")
+    
+    # Limit to top 10 results by relevance score
+    return heapq.nlargest(10, results, key=result_score), not not_done
 
+@cached('cryptopanic', NEWS_TTL)
 def fetch_from_cryptopanic(query):
     """
     Fetch news from CryptoPanic API
@@ -88,44 +322,36 @@ def fetch_from_cryptopanic(query):
         url = f"https://cryptopanic.com/api/v1/posts/?auth_token={CRYPTOPANIC_API_KEY}&public=true"
         
         # Add filter for specific coins
-        coin_filters = {
-            'bitcoin': 'BTC',
-            'btc': 'BTC',
-            'ethereum': 'ETH',
-            'eth': 'ETH',
-            'solana': 'SOL',
-            'sol': 'SOL'
-        }
-        
-        query_lower = query.lower()
-        for keyword, currency in coin_filters.items():
-            if keyword in query_lower:
+        for keyword in COIN_RE.findall(query):
+            currency = KEYWORD_TO_CURRENCY.get(keyword.lower())
+            if currency:
                 url += f"&currencies={currency}"
                 break
         
         print(f"Fetching from CryptoPanic: {url}")
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=UPSTREAM_TIMEOUT)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             for post in data.get('results', [])[:5]:
+                title = post.get('title') or ''
+                source_title = (post.get('source') or {}).get('title') or ''
+                published = post.get('published_at') or ''
+                positive_votes = (post.get('votes') or {}).get('positive') or 0
+                
                 results.append({
                     "result_metadata": {
-                        "score": calculate_relevance_score(query, post.get('title', ''))
+                        "score": calculate_relevance_score(query, title)
                     },
-                    "title": post.get('title', ''),
-                    "body": (
-                        f"{post.get('title', '')}. "
-                        f"{post.get('source', {}).get('title', '')} - "
-                        f"Published: {post.get('published_at', '')}"
-                    ),
-                    "url": post.get('url', ''),
+                    "title": title,
+                    "body": f"{title}. {source_title} - Published: {published}",
+                    "url": post.get('url') or '',
                     "highlight": {
                         "body": [
-                            post.get('title', ''),
-                            f"Source: {post.get('source', {}).get('title', 'Unknown')}",
-                            f"Votes: {post.get('votes', {}).get('positive', 0)}"
+                            title,
+                            f"Source: {source_title or 'Unknown'}",
+                            f"Votes: {positive_votes}"
                         ]
                     }
                 })
@@ -137,119 +363,106 @@ def fetch_from_cryptopanic(query):
     
     return results
 
+@cached('coingecko', PRICES_TTL)
 def fetch_from_coingecko(query):
     """
-    Fetch trending coins from CoinGecko
+    Fetch top coins and current prices from CoinGecko in a single request
     """
     results = []
     
+    # Check if specific coins are mentioned
+    coin_ids = list(dict.fromkeys(KEYWORD_TO_ID[keyword.lower()] for keyword in COIN_RE.findall(query)))
+    
+    # If no specific coin, get top coins
+    if not coin_ids:
+        coin_ids = ['bitcoin', 'ethereum', 'solana']
+    
     try:
-        url = "https://api.coingecko.com/api/v3/search/trending"
-        response = requests.get(url, timeout=10)
+        ids = list(dict.fromkeys(TOP_COIN_IDS + coin_ids))
+        url = "https://api.coingecko.com/api/v3/coins/markets"
+        params = {
+            "vs_currency": "usd",
+            "ids": ','.join(ids),
+            "order": "market_cap_desc",
+            "per_page": len(ids),
+            "page": 1,
+            "price_change_percentage": "24h"
+        }
+        response = SESSION.get(url, params=params, timeout=UPSTREAM_TIMEOUT)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
-            for coin in data.get('coins', [])[:3]:
-                coin_data = coin.get('item', {})
+            # Top coins by market cap, skipping coins that get a price update below
+            top_coins = [coin_data for coin_data in data if coin_data.get('id') not in coin_ids]
+            for coin_data in top_coins[:3]:
+                name = coin_data.get('name') or ''
+                symbol = (coin_data.get('symbol') or '').upper()
+                rank = coin_data.get('market_cap_rank') or 'N/A'
+                price = coin_data.get('current_price') or 'N/A'
+                volume = coin_data.get('total_volume') or 'N/A'
+                
                 results.append({
                     "result_metadata": {
-                        "score": calculate_relevance_score(query, coin_data.get('name', ''))
+                        "score": calculate_relevance_score(query, name)
                     },
-                    "title": f"🔥 {coin_data.get('name', '')} ({coin_data.get('symbol', '').upper()}) - Trending",
+                    "title": f"🏆 {name} ({symbol}) - Top by Market Cap",
                     "body": (
-                        f"{coin_data.get('name', '')} is currently trending on CoinGecko. "
-                        f"Market Cap Rank: #{coin_data.get('market_cap_rank', 'N/A')}. "
-                        f"Price: ${coin_data.get('data', {}).get('price', 'N/A')}"
+                        f"{name} is one of the largest coins on CoinGecko. "
+                        f"Market Cap Rank: #{rank}. "
+                        f"Price: ${price}"
                     ),
-                    "url": f"https://www.coingecko.com/en/coins/{coin_data.get('id', '')}",
+                    "url": f"https://www.coingecko.com/en/coins/{coin_data.get('id') or ''}",
                     "highlight": {
                         "body": [
-                            f"🔥 Trending: {coin_data.get('name', '')}",
-                            f"Rank: #{coin_data.get('market_cap_rank', 'N/A')}",
-                            f"24h Volume: ${coin_data.get('data', {}).get('total_volume', 'N/A')}"
+                            f"🏆 Top Coin: {name}",
+                            f"Rank: #{rank}",
+                            f"24h Volume: ${volume}"
                         ]
                     }
                 })
-    
-    except Exception as e:
-        print(f"Error fetching from CoinGecko trending: {e}")
-    
-    return results
-
-def fetch_crypto_prices(query):
-    """
-    Fetch current prices for major cryptocurrencies
-    """
-    results = []
-    
-    # Map common queries to coin IDs
-    coin_map = {
-        'bitcoin': 'bitcoin',
-        'btc': 'bitcoin',
-        'ethereum': 'ethereum',
-        'eth': 'ethereum',
-        'solana': 'solana',
-        'sol': 'solana',
-        'cardano': 'cardano',
-        'ada': 'cardano',
-        'xrp': 'ripple',
-        'ripple': 'ripple'
-    }
-    
-    query_lower = query.lower()
-    coin_ids = []
-    
-    # Check if specific coin is mentioned
-    for keyword, coin_id in coin_map.items():
-        if keyword in query_lower:
-            coin_ids.append(coin_id)
-    
-    # If no specific coin, get top coins
-    if not coin_ids:
-        coin_ids = ['bitcoin', 'ethereum', 'solana']
-    
-    try:
-        ids = ','.join(coin_ids)
-        url = (
-            "https://api.coingecko.com/api/v3/simple/price"
-            f"?ids={ids}&vs_currencies=usd"
-            "&include_24hr_change=true&include_market_cap=true"
-        )
-        response = requests.get(url, timeout=10)
-        
-        if response.status_code == 200:
-            data = response.json()
             
-            for coin_id, price_data in data.items():
-                change_24h = price_data.get('usd_24h_change', 0)
+            # Price updates for the requested coins
+            coins_by_id = {coin_data.get('id'): coin_data for coin_data in data}
+            for coin_id in coin_ids:
+                price_data = coins_by_id.get(coin_id)
+                if price_data is None:
+                    continue
+                
+                coin_name = coin_id.capitalize()
+                price = price_data.get('current_price') or 0
+                change_24h = price_data.get('price_change_percentage_24h') or 0
+                market_cap = price_data.get('market_cap') or 0
                 emoji = "📈" if change_24h > 0 else "📉"
                 
                 results.append({
                     "result_metadata": {
                         "score": 0.9
                     },
-                    "title": f"{emoji} {coin_id.capitalize()} Price Update",
+                    "title": f"{emoji} {coin_name} Price Update",
                     "body": (
-                        f"{coin_id.capitalize()} is trading at ${price_data.get('usd', 0):,.2f} "
+                        f"{coin_name} is trading at ${price:,.2f} "
                         f"with a 24h change of {change_24h:.2f}%. "
-                        f"Market Cap: ${price_data.get('usd_market_cap', 0):,.0f}"
+                        f"Market Cap: ${market_cap:,.0f}"
                     ),
                     "url": f"https://www.coingecko.com/en/coins/{coin_id}",
                     "highlight": {
                         "body": [
-                            f"Price: ${price_data.get('usd', 0):,.2f}",
+                            f"Price: ${price:,.2f}",
                             f"24h Change: {change_24h:.2f}%",
-                            f"Market Cap: ${price_data.get('usd_market_cap', 0):,.0f}"
+                            f"Market Cap: ${market_cap:,.0f}"
                         ]
                     }
                 })
+        else:
+            print(f"CoinGecko API error: {response.status_code} - {response.text}")
     
     except Exception as e:
-        print(f"Error fetching crypto prices: {e}")
+        print(f"Error fetching from CoinGecko: {e}")
     
     return results
 
+@cached('newsapi', NEWS_TTL)
 def fetch_from_newsapi(query):
     """
     Fetch crypto news from NewsAPI.org
@@ -264,24 +477,28 @@ def fetch_from_newsapi(query):
             f"&apiKey={NEWSAPI_KEY}&sortBy=publishedAt&pageSize=5"
         )
         
-        response = requests.get(url, timeout=10)
+        response = SESSION.get(url, timeout=UPSTREAM_TIMEOUT)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             for article in data.get('articles', [])[:3]:
+                title = article.get('title') or ''
+                source_name = (article.get('source') or {}).get('name') or 'Unknown'
+                published = article.get('publishedAt') or ''
+                
                 results.append({
                     "result_metadata": {
-                        "score": calculate_relevance_score(query, article.get('title', ''))
+                        "score": calculate_relevance_score(query, title)
                     },
-                    "title": article.get('title', ''),
-                    "body": article.get('description', '') or article.get('content', '')[:200],
+                    "title": title,
+                    "body": article.get('description') or (article.get('content') or '')[:200],
                     "url": article.get('url', ''),
                     "highlight": {
                         "body": [
-                            article.get('title', ''),
-                            f"Source: {article.get('source', {}).get('name', 'Unknown')}",
-                            f"Published: {article.get('publishedAt', '')}"
+                            title,
+                            f"Source: {source_name}",
+                            f"Published: {published}"
                         ]
                     }
                 })
@@ -291,6 +508,16 @@ def fetch_from_newsapi(query):
     
     return results
 
+def result_score(result):
+    """Relevance score of a formatted search result"""
+    return result.get('result_metadata', {}).get('score', 0)
+
+@lru_cache(maxsize=1024)
+def tokenize(text):
+    """Lowercased word tokens of text"""
+    return frozenset(WORD_RE.findall(text.lower()))
+
+@lru_cache(maxsize=1024)
 def calculate_relevance_score(query, text):
     """
     Simple relevance scoring based on keyword matching
@@ -300,42 +527,46 @@ def calculate_relevance_score(query, text):
         return 0.5
     
     query_lower = query.lower()
-    text_lower = text.lower()
     
     # Check for exact matches
-    if query_lower in text_lower:
+    if query_lower in text.lower():
         return 0.95
     
     # Check for keyword matches
-    query_words = [w for w in query_lower.split() if len(w) > 3]
+    query_words = {w for w in WORD_RE.findall(query_lower) if len(w) > 3}
     if not query_words:
         return 0.5
     
-    matches = sum(1 for word in query_words if word in text_lower)
+    matches = len(query_words & tokenize(text))
     
     return 0.5 + (matches / len(query_words)) * 0.4
 
+# API info only depends on configuration, so it is serialized once at startup
+HOME_BODY = orjson.dumps({
+    "service": "Crypto News API",
+    "version": "2.0",
+    "status": "running",
+    "data_sources": {
+        "coingecko": "✅ Active (Top coins by market cap & prices - trending feed removed)",
+        "cryptopanic": "✅ Active" if CRYPTOPANIC_API_KEY else "⚠️ No API key",
+        "newsapi": "✅ Active" if NEWSAPI_KEY else "⚠️ No API key"
+    },
+    "endpoints": {
+        "/search": "POST - Main search endpoint",
+        "/health": "GET - Health check",
+        "/stats": "GET - Cache hit/miss counters"
+    }
+})
+
 @app.route('/', methods=['GET'])
 def home():
     """Root endpoint with API info"""
-    return jsonify({
-        "service": "Crypto News API",
-        "version": "2.0",
-        "status": "running",
-        "data_sources": {
-            "coingecko": "✅ Active (Trending coins & prices)",
-            "cryptopanic": "✅ Active" if CRYPTOPANIC_API_KEY else "⚠️ No API key",
-            "newsapi": "✅ Active" if NEWSAPI_KEY else "⚠️ No API key"
-        },
-        "endpoints": {
-            "/search": "POST - Main search endpoint",
-            "/health": "GET - Health check"
-        }
-    })
+    return Response(HOME_BODY, mimetype='application/json')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     print(f"Starting Crypto News API on port {port}...")
     print(f"CryptoPanic API: {'✅ Configured' if CRYPTOPANIC_API_KEY else '⚠️ Not configured'}")
     print(f"NewsAPI: {'✅ Configured' if NEWSAPI_KEY else '⚠️ Not configured'}")
-    app.run(host='0.0.0.0', port=port, debug=True)
+    # Local development only - production runs under gunicorn (see Procfile)
+    app.run(host='0.0.0.0', port=port, debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -0,0 +1,283 @@
+import socket
+import threading
+import time
+
+import orjson
+import pytest
+import requests
+
+import app
+
+
+COINGECKO_MARKETS = [
+    {
+        "id": "bitcoin",
+        "symbol": "btc",
+        "name": "Bitcoin",
+        "market_cap_rank": 1,
+        "current_price": 65000,
+        "market_cap": 1280000000000,
+        "total_volume": 30000000000,
+        "price_change_percentage_24h": 1.5
+    }
+]
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.content = orjson.dumps(payload)
+        self.text = self.content.decode()
+
+
+@pytest.fixture(autouse=True)
+def isolated_app(monkeypatch):
+    """Run with only the keyless CoinGecko source and no Redis cache"""
+    monkeypatch.setattr(app, 'CRYPTOPANIC_API_KEY', '')
+    monkeypatch.setattr(app, 'NEWSAPI_KEY', '')
+    monkeypatch.setattr(app, 'CACHE', None)
+
+
+def run_concurrently(target, count):
+    """Call target from count threads released at the same time"""
+    barrier = threading.Barrier(count)
+    outcomes = [None] * count
+    
+    def worker(index):
+        barrier.wait()
+        try:
+            outcomes[index] = target()
+        except BaseException as e:
+            outcomes[index] = e
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def test_concurrent_identical_searches_share_one_upstream_call(monkeypatch):
+    calls = []
+    
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        time.sleep(0.3)
+        return FakeResponse(COINGECKO_MARKETS)
+    
+    monkeypatch.setattr(app.SESSION, 'get', fake_get)
+    
+    outcomes = run_concurrently(lambda: app.fetch_search_results('bitcoin'), 5)
+    
+    assert len(calls) == 1
+    assert outcomes[0]
+    assert all(outcome == outcomes[0] for outcome in outcomes)
+    assert app.INFLIGHT == {}
+
+
+def test_concurrent_identical_searches_share_leader_error(monkeypatch):
+    calls = []
+    
+    def failing_fetch(query, filter_param=''):
+        calls.append(query)
+        time.sleep(0.3)
+        raise RuntimeError("upstream exploded")
+    
+    monkeypatch.setattr(app, 'fetch_crypto_news', failing_fetch)
+    
+    outcomes = run_concurrently(lambda: app.fetch_search_results('bitcoin'), 5)
+    
+    assert len(calls) == 1
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert app.INFLIGHT == {}
+
+
+class LeaderAborted(BaseException):
+    """Stands in for gevent's GreenletExit/Timeout or a KeyboardInterrupt"""
+
+
+def test_concurrent_identical_searches_share_leader_base_exception(monkeypatch):
+    calls = []
+    
+    def aborted_fetch(query, filter_param=''):
+        calls.append(query)
+        time.sleep(0.3)
+        raise LeaderAborted()
+    
+    monkeypatch.setattr(app, 'fetch_crypto_news', aborted_fetch)
+    
+    outcomes = run_concurrently(lambda: app.fetch_search_results('bitcoin'), 5)
+    
+    assert len(calls) == 1
+    assert all(isinstance(outcome, LeaderAborted) for outcome in outcomes)
+    assert app.INFLIGHT == {}
+
+
+def test_top_coin_cards_skip_coins_with_price_updates(monkeypatch):
+    markets = [
+        {"id": coin_id, "symbol": coin_id[:3], "name": coin_id.capitalize(), "market_cap_rank": rank}
+        for rank, coin_id in enumerate(app.TOP_COIN_IDS, start=1)
+    ]
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(markets))
+    
+    results = app.fetch_from_coingecko('bitcoin and ethereum news')
+    
+    top_urls = [r['url'] for r in results if 'Top by Market Cap' in r['title']]
+    price_urls = [r['url'] for r in results if 'Price Update' in r['title']]
+    assert price_urls == [
+        "https://www.coingecko.com/en/coins/bitcoin",
+        "https://www.coingecko.com/en/coins/ethereum"
+    ]
+    assert top_urls == [
+        "https://www.coingecko.com/en/coins/tether",
+        "https://www.coingecko.com/en/coins/binancecoin",
+        "https://www.coingecko.com/en/coins/solana"
+    ]
+
+
+def test_concurrent_distinct_searches_all_finish_within_deadline(monkeypatch):
+    def slow_get(url, **kwargs):
+        time.sleep(1.5)
+        return FakeResponse(COINGECKO_MARKETS)
+    
+    monkeypatch.setattr(app.SESSION, 'get', slow_get)
+    
+    queries = [f"bitcoin outlook {i}" for i in range(12)]
+    barrier = threading.Barrier(len(queries))
+    outcomes = {}
+    
+    def search(query):
+        barrier.wait()
+        outcomes[query] = app.fetch_search_results(query)
+    
+    threads = [threading.Thread(target=search, args=(query,)) for query in queries]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert all(outcomes[query] for query in queries)
+
+
+def test_newsapi_tolerates_null_nested_fields(monkeypatch):
+    articles = {
+        "articles": [
+            {"title": "Bitcoin rallies", "source": None, "publishedAt": None, "description": None, "content": None},
+            {"title": "Ether slips", "source": {"name": "CoinDesk"}, "publishedAt": "2024-01-01T00:00:00Z"}
+        ]
+    }
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(articles))
+    
+    results = app.fetch_from_newsapi('bitcoin')
+    
+    assert [r['title'] for r in results] == ["Bitcoin rallies", "Ether slips"]
+    assert results[0]['highlight']['body'][1] == "Source: Unknown"
+    assert results[1]['highlight']['body'][1] == "Source: CoinDesk"
+
+
+def test_partial_search_results_are_not_cached(monkeypatch):
+    cached_keys = []
+    
+    def slow_cryptopanic_get(url, **kwargs):
+        if 'cryptopanic' in url:
+            time.sleep(0.5)
+            return FakeResponse({"results": []})
+        return FakeResponse(COINGECKO_MARKETS)
+    
+    monkeypatch.setattr(app, 'CRYPTOPANIC_API_KEY', 'test-key')
+    monkeypatch.setattr(app, 'SEARCH_DEADLINE', 0.2)
+    monkeypatch.setattr(app.SESSION, 'get', slow_cryptopanic_get)
+    monkeypatch.setattr(app, 'cache_set', lambda key, ttl, value: cached_keys.append(key))
+    
+    results = app.fetch_search_results('bitcoin')
+    
+    assert results
+    assert "cp:search:bitcoin:" not in cached_keys
+
+
+def test_complete_search_results_are_cached(monkeypatch):
+    cached_keys = []
+    
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(COINGECKO_MARKETS))
+    monkeypatch.setattr(app, 'cache_set', lambda key, ttl, value: cached_keys.append(key))
+    
+    results = app.fetch_search_results('bitcoin')
+    
+    assert results
+    assert "cp:search:bitcoin:" in cached_keys
+
+
+def test_coin_keywords_ignore_unicode_case_folding(monkeypatch):
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(COINGECKO_MARKETS))
+    
+    # U+017F (long s) case-folds to "s" but is not a coin keyword
+    assert app.COIN_RE.findall('ſol news') == []
+    assert app.fetch_from_coingecko('ſol price')
+
+
+def test_cryptopanic_tolerates_null_nested_fields(monkeypatch):
+    posts = {
+        "results": [
+            {"title": None, "source": None, "published_at": None, "url": None, "votes": None},
+            {"title": "Bitcoin ETF inflows", "source": {"title": None}, "votes": {"positive": None}}
+        ]
+    }
+    monkeypatch.setattr(app, 'CRYPTOPANIC_API_KEY', 'test-key')
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(posts))
+    
+    results = app.fetch_from_cryptopanic('bitcoin')
+    
+    assert [r['title'] for r in results] == ["", "Bitcoin ETF inflows"]
+    assert all("None" not in r['body'] for r in results)
+    assert results[0]['url'] == ""
+    assert results[1]['highlight']['body'][1:] == ["Source: Unknown", "Votes: 0"]
+
+
+def test_coingecko_tolerates_null_top_coin_fields(monkeypatch):
+    markets = [
+        {"id": "tether", "symbol": None, "name": None, "market_cap_rank": None,
+         "current_price": None, "total_volume": None},
+        {"id": "bitcoin", "symbol": "btc", "name": "Bitcoin", "market_cap_rank": 1,
+         "current_price": None, "market_cap": None, "price_change_percentage_24h": None}
+    ]
+    monkeypatch.setattr(app.SESSION, 'get', lambda url, **kwargs: FakeResponse(markets))
+    
+    results = app.fetch_from_coingecko('bitcoin')
+    
+    top_card, price_card = results
+    assert top_card['title'] == "🏆  () - Top by Market Cap"
+    assert "None" not in top_card['body']
+    assert top_card['highlight']['body'][1:] == ["Rank: #N/A", "24h Volume: $N/A"]
+    assert price_card['highlight']['body'][0] == "Price: $0.00"
+
+
+def test_stalled_upstream_call_fits_inside_search_deadline():
+    # A server that accepts connections but never replies
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(('127.0.0.1', 0))
+    server.listen(8)
+    accepted = []
+    
+    def accept_forever():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            accepted.append(conn)
+    
+    threading.Thread(target=accept_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.getsockname()[1]}/"
+    
+    start = time.monotonic()
+    try:
+        with pytest.raises(requests.exceptions.RequestException):
+            app.SESSION.get(url, timeout=app.UPSTREAM_TIMEOUT)
+        elapsed = time.monotonic() - start
+    finally:
+        server.close()
+        for conn in accepted:
+            conn.close()
+    
+    assert elapsed < app.SEARCH_DEADLINE